@@ -1,40 +1,345 @@
 #!/usr/bin/env python3
 import os
+import re
+import gzip
+import hashlib
+import shutil
+import time
+import asyncio
+import aiohttp
+from aiohttp import web
+import orjson
 import yaml
-from github import Github, Auth
-from datetime import datetime
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from urllib.parse import urlencode
 
-# Initialize GitHub client with new auth method
-auth = Auth.Token(os.environ['GITHUB_TOKEN'])
-g = Github(auth=auth)
+# GitHub REST API access (GITHUB_API_URL is set by GitHub Actions, e.g. on GHES)
+github_token = os.environ['GITHUB_TOKEN']
+api_url = os.environ.get('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
 user_login = os.environ.get('DASHBOARD_USER', 'gediminasvenc')
 
+# Generation time shown on the page, taken once at startup
+generated_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
 # Filter for specific workflows (comma-separated, or leave empty for all)
 workflow_filter = os.environ.get('WORKFLOW_FILTER', 'sync-odoo,sync-3rd-party').lower()
 workflow_filters = [f.strip() for f in workflow_filter.split(',') if f.strip()]
 
-print(f"Workflow filter: {workflow_filters if workflow_filters else 'None (showing all workflows)'}")
+# Serve the dashboard on this port and stream rows in as repos finish, instead of writing output/ (0 = off)
+live_port = int(os.environ.get('DASHBOARD_LIVE_PORT', '0'))
+# The live server has no authentication and fetches with our token, so it only listens locally by default
+live_host = os.environ.get('DASHBOARD_LIVE_HOST', '127.0.0.1')
+
+# Only show runs created in the last N days (0 for no limit). Workflows that haven't run within the
+# window drop off the dashboard, in exchange for not looking up their stale runs at all.
+since_days = int(os.environ.get('DASHBOARD_SINCE_DAYS', '14'))
+since_date = (datetime.now(timezone.utc) - timedelta(days=since_days)).strftime('%Y-%m-%d') if since_days else None
+
+# Maximum number of repos fetched at the same time (keeps us clear of GitHub's secondary rate limits)
+concurrency = 10
+
+# Size of the keep-alive connection pool shared by every API call
+pool_size = 20
+
+# GraphQL endpoint (GITHUB_GRAPHQL_URL is set by GitHub Actions) and repos returned per query page
+graphql_url = os.environ.get('GITHUB_GRAPHQL_URL', f"{api_url}/graphql")
+graphql_page_size = 25
+
+# Per repo: the workflow files and the GitHub Actions (app 15368) check suites of the default branch HEAD
+graphql_repo_fragment = """
+fragment dashboardRepo on Repository {
+  object(expression: "HEAD:.github/workflows") { ... on Tree { entries { name } } }
+  defaultBranchRef {
+    name
+    target {
+      ... on Commit {
+        checkSuites(last: 20, filterBy: {appId: 15368}) {
+          nodes {
+            status
+            conclusion
+            createdAt
+            updatedAt
+            branch { name }
+            workflowRun { databaseId url workflow { name } file { path } }
+            checkRuns(first: 100, filterBy: {checkType: LATEST}) {
+              pageInfo { hasNextPage }
+              nodes { name status conclusion startedAt completedAt }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# One page of the owner's non-archived repos, each with its workflow runs (same repos as the REST listing)
+graphql_repos_query = f"""
+query($login: String!, $cursor: String) {{
+  repositoryOwner(login: $login) {{
+    repositories(first: {graphql_page_size}, after: $cursor, isArchived: false, ownerAffiliations: [OWNER]) {{
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{ nameWithOwner url ...dashboardRepo }}
+    }}
+  }}
+}}
+{graphql_repo_fragment}"""
+
+# Compiled HTML templates live next to this script; their bytecode is cached with the API responses
+template_cache_dir = os.path.join('cache', 'jinja')
+os.makedirs(template_cache_dir, exist_ok=True)
+template_env = Environment(
+    loader=FileSystemLoader(os.path.dirname(os.path.abspath(__file__))),
+    autoescape=True,
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+    bytecode_cache=FileSystemBytecodeCache(template_cache_dir),
+)
+
 
-# Get user or organization
-try:
-    # Try as organization first
-    entity = g.get_organization(user_login)
-    print(f"Fetching workflow status for organization: {user_login}")
-except:
-    # Fall back to user
-    entity = g.get_user(user_login)
-    print(f"Fetching workflow status for user: {user_login}")
+def minify_css(css):
+    """Strip comments and collapse whitespace in a stylesheet"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{}:;,])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+# The stylesheet sits next to the page, minified once at startup; its fingerprint in the
+# link lets browsers cache it until it actually changes
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard.css')) as f:
+    dashboard_css = minify_css(f.read())
+css_version = hashlib.sha1(dashboard_css.encode()).hexdigest()[:8]
+
+# Status badge class per run conclusion/status (anything else looks cancelled)
+badge_classes = {
+    'success': 'badge-success',
+    'failure': 'badge-failure',
+    'in_progress': 'badge-in-progress',
+    'cancelled': 'badge-cancelled',
+}
+
+# Sort by workflow type, then by status (failed first, then in progress, then success)
+status_priority = {'failure': 0, 'cancelled': 1, 'in_progress': 2, 'success': 3, 'completed': 4}
+workflow_type_priority = {
+    '🐭 Odoo': 0,
+    '📦 3rd Party': 1,
+    '🔄 Other': 2
+}
+
+# Workflow type by workflow name or file path, first match wins (anything else is '🔄 Other')
+workflow_type_patterns = (
+    (re.compile('sync-odoo', re.IGNORECASE), '🐭 Odoo'),
+    (re.compile('3rd|third', re.IGNORECASE), '📦 3rd Party'),
+)
 
 # Load branch information from workflow files in the dashboard repo
 branch_config = {}
 
-def load_workflow_branches_from_repo(repo, workflow_file):
+
+@dataclass(slots=True)
+class RepoRow:
+    """One dashboard row: the latest run of a workflow in a repo"""
+    name: str
+    url: str
+    workflow_name: str
+    workflow_type: str
+    status: str
+    conclusion: str | None
+    state: str
+    badge_class: str
+    run_url: str
+    updated_at: str
+    run_id: int
+    branch: str
+    jobs: list
+    job_count: int
+    success_jobs: int
+    failure_jobs: int
+    in_progress_jobs: int
+    job_summary: str
+    sort_key: tuple
+
+
+# Retries of rate-limited (403/429) and transient (502/503/504) responses, with exponential back-off
+max_retries = 5
+retry_backoff = 0.5
+
+# Once fewer calls than this are left, requests wait for the rate-limit window to reset. GitHub keeps a
+# separate budget per resource (core, search, graphql, ...), so each one is paused on its own.
+rate_limit_reserve = 5
+rate_limit_resume_at = {}
+
+# Conditional-request cache: url -> {'etag', 'payload', 'next'}, kept between dashboard runs
+etag_cache_file = os.path.join('cache', 'etags.json')
+etag_cache = {}
+used_etags = set()
+
+# Jobs of runs seen before: 'run_id@updated_at' -> jobs, so an unchanged run never refetches them
+jobs_cache_file = os.path.join('cache', 'jobs.json')
+jobs_cache = {}
+used_jobs = set()
+cached_job_fields = ('name', 'status', 'conclusion', 'started_at', 'completed_at')
+
+
+def load_cache(cache_file, cache):
+    """Load a cache written by the previous run, if any"""
+    try:
+        with open(cache_file, 'rb') as f:
+            cache.update(orjson.loads(f.read()))
+        print(f"Loaded {len(cache)} cached entries from {cache_file}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"  ⚠️  Could not load {cache_file}: {e}")
+
+
+def save_cache(cache_file, cache, used):
+    """Persist a cache, dropping entries this run no longer requested"""
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    with open(cache_file, 'wb') as f:
+        f.write(orjson.dumps({key: cache[key] for key in used}))
+
+
+def retry_delay(resp, attempt):
+    """Seconds to wait before retrying a response, or None when it should not be retried"""
+    if resp.status in (403, 429):
+        # Secondary rate limit
+        if 'Retry-After' in resp.headers:
+            return float(resp.headers['Retry-After'])
+        # Primary rate limit exhausted: wait for the reset, or back off if it isn't given
+        if resp.headers.get('X-RateLimit-Remaining') == '0':
+            reset = resp.headers.get('X-RateLimit-Reset')
+            if reset is not None:
+                return max(0.0, float(reset) - time.time()) + 1
+        # Anything else on a 403 is a plain permission error
+        elif resp.status == 403:
+            return None
+    elif resp.status not in (502, 503, 504):
+        return None
+    return retry_backoff * 2 ** attempt
+
+
+def rate_limit_resource(url):
+    """The rate-limit budget (X-RateLimit-Resource) a request to `url` counts against"""
+    if url == graphql_url:
+        return 'graphql'
+    if url.startswith(f"{api_url}/search/"):
+        return 'search'
+    return 'core'
+
+
+@asynccontextmanager
+async def api_request(session, method, url, **kwargs):
+    """Send a GitHub API request, backing off on rate limits and transient server errors"""
+    resource = rate_limit_resource(url)
+
+    for attempt in range(max_retries + 1):
+        # Hold back while this request's rate-limit budget is (nearly) used up
+        wait = rate_limit_resume_at.get(resource, 0.0) - time.time()
+        if wait > 0:
+            print(f"  ⏳ {resource} rate limit almost exhausted, waiting {wait:.0f}s")
+            await asyncio.sleep(wait)
+
+        resp = await session.request(method, url, **kwargs)
+
+        remaining = resp.headers.get('X-RateLimit-Remaining')
+        reset = resp.headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None and int(remaining) < rate_limit_reserve:
+            resource = resp.headers.get('X-RateLimit-Resource', resource)
+            rate_limit_resume_at[resource] = max(rate_limit_resume_at.get(resource, 0.0), float(reset))
+
+        delay = retry_delay(resp, attempt)
+        if delay is None or attempt == max_retries:
+            break
+        resp.release()
+        print(f"  ⏳ {resp.status} from {resp.url.path}, retrying in {delay:.0f}s")
+        await asyncio.sleep(delay)
+
+    try:
+        resp.raise_for_status()
+        yield resp
+    finally:
+        resp.release()
+
+
+async def get_json(session, url, params=None):
+    """Conditional GET of a GitHub REST endpoint, returning (JSON body, next page url)
+
+    A 304 Not Modified (free of charge against the rate limit) reuses the cached body.
+    """
+    if params:
+        url = f"{url}?{urlencode(params)}"
+    cached = etag_cache.get(url)
+    headers = {'If-None-Match': cached['etag']} if cached else None
+
+    async with api_request(session, 'GET', url, headers=headers) as resp:
+        if resp.status == 304:
+            used_etags.add(url)
+            return cached['payload'], cached['next']
+        data = orjson.loads(await resp.read())
+        next_link = resp.links.get('next')
+        next_url = str(next_link['url']) if next_link else None
+        etag = resp.headers.get('ETag')
+
+    if etag:
+        etag_cache[url] = {'etag': etag, 'payload': data, 'next': next_url}
+        used_etags.add(url)
+    return data, next_url
+
+
+async def fetch_json(session, url, params=None):
+    """GET a GitHub REST endpoint and return the decoded JSON body"""
+    data, _ = await get_json(session, url, params)
+    return data
+
+
+async def fetch_raw(session, url):
+    """Conditional GET of a file's raw contents, reusing the cached text on a 304"""
+    cached = etag_cache.get(url)
+    headers = {'Accept': 'application/vnd.github.raw+json'}
+    if cached:
+        headers['If-None-Match'] = cached['etag']
+
+    async with api_request(session, 'GET', url, headers=headers) as resp:
+        if resp.status == 304:
+            used_etags.add(url)
+            return cached['payload']
+        text = await resp.text()
+        etag = resp.headers.get('ETag')
+
+    if etag:
+        etag_cache[url] = {'etag': etag, 'payload': text, 'next': None}
+        used_etags.add(url)
+    return text
+
+
+async def fetch_all(session, url, key, params=None):
+    """Follow REST pagination (Link: rel="next") and collect every item under `key` (or the bare list)"""
+    items = []
+    params = {'per_page': 100, **(params or {})}
+    while url:
+        data, url = await get_json(session, url, params)
+        items.extend(data[key] if key else data)
+        # The next link already carries the query string
+        params = None
+    return items
+
+
+async def load_workflow_branches_from_repo(session, repo_name, workflow_file):
     """Load branches configuration from workflow YAML files in GitHub repo"""
     config = {}
     try:
-        # Get the workflow file from the repo
-        file_content = repo.get_contents(f".github/workflows/{workflow_file}")
-        workflow_data = yaml.safe_load(file_content.decoded_content)
+        # Get the raw workflow file from the repo
+        url = f"{api_url}/repos/{repo_name}/contents/.github/workflows/{workflow_file}"
+        workflow_data = yaml.safe_load(await fetch_raw(session, url))
         
         # Extract matrix configuration
         if 'jobs' in workflow_data:
@@ -50,7 +355,7 @@ def load_workflow_branches_from_repo(repo, workflow_file):
                                 if isinstance(branches, str):
                                     branch_list = [b.strip() for b in branches.split(',')]
                                 else:
-                                    branch_list = branches
+                                    branch_list = [str(b) for b in branches]
                                 config[fork_repo] = branch_list
         print(f"  ✓ Loaded {len(config)} repos from {workflow_file}")
     except Exception as e:
@@ -58,551 +363,598 @@ def load_workflow_branches_from_repo(repo, workflow_file):
     
     return config
 
-# Get the dashboard repo to read workflow files
-print("Loading workflow branch configurations...")
-try:
-    dashboard_repo = g.get_repo(f"{user_login}/sync-forks")
-    branch_config.update(load_workflow_branches_from_repo(dashboard_repo, 'sync-odoo.yml'))
-    branch_config.update(load_workflow_branches_from_repo(dashboard_repo, 'sync-3rd-party.yml'))
-except Exception as e:
-    print(f"  ⚠️  Could not access sync-forks repo: {e}")
-    print("  ℹ️  Make sure the repository is named 'sync-forks'")
 
-print(f"Total repos with branch info: {len(branch_config)}\n")
+def matches_workflow_filter(name, path):
+    """Check a workflow's name and file path against the workflow filter (everything matches when it is empty)
 
-# Get all repos
-repos = entity.get_repos()
+    Matching the path too picks up e.g. .github/workflows/sync-odoo.yml whatever its display name is.
+    """
+    name_lower = name.lower()
+    path_lower = path.lower()
+    return not workflow_filters or any(filter_term in name_lower or filter_term in path_lower
+                                       for filter_term in workflow_filters)
 
-dashboard_data = []
 
-for repo in repos:
-    try:
-        # Skip archived repos
-        if repo.archived:
-            continue
-            
-        # Get workflow runs
-        workflows = repo.get_workflows()
-        
-        if workflows.totalCount == 0:
+def select_latest_runs(runs):
+    """Yield the newest run of every workflow file that passes the workflow filter"""
+    # Track workflows we've already processed for this repo
+    processed_workflows = set()
+
+    # Process each run (newest first)
+    for run in runs:
+        # Apply workflow filter if specified
+        if not matches_workflow_filter(run['name'], run['path']):
             continue
-            
-        # Get ALL workflow runs (not just latest)
-        all_runs = repo.get_workflow_runs()
-        
-        if all_runs.totalCount == 0:
+
+        # Skip if we already have a run for this workflow in this repo
+        # (we want the latest for each workflow; two files can share a display name)
+        if run['path'] in processed_workflows:
             continue
-        
-        # Track workflows we've already processed for this repo
-        processed_workflows = set()
-        
-        # Process each run
-        for run in all_runs:
-            workflow_name_lower = run.name.lower()
-            
-            # Apply workflow filter if specified
-            if workflow_filters:
-                if not any(filter_term in workflow_name_lower for filter_term in workflow_filters):
-                    continue
-            
-            # Skip if we already have a run for this workflow in this repo
-            # (we want the latest for each workflow)
-            if run.name in processed_workflows:
+
+        processed_workflows.add(run['path'])
+        yield run
+
+
+def build_repo_data(repo, run, jobs):
+    """Build the dashboard row for one workflow run and its jobs"""
+    # Determine workflow type/category
+    workflow_type = next(
+        (label for pattern, label in workflow_type_patterns
+         if pattern.search(run['name']) or pattern.search(run['path'])),
+        '🔄 Other',
+    )
+
+    job_details = []
+    # Job counts for the summary, gathered in the same pass
+    success_jobs = failure_jobs = in_progress_jobs = 0
+
+    for job in jobs:
+        job_name = job['name']
+        if job['conclusion'] == 'success':
+            success_jobs += 1
+        elif job['conclusion'] == 'failure':
+            failure_jobs += 1
+        if job['status'] == 'in_progress':
+            in_progress_jobs += 1
+
+        # Extract repo name from job name (e.g., "Sync linserv/CybroAddons" -> "linserv/CybroAddons")
+        repo_from_job = None
+        if 'Sync' in job_name:
+            parts = job_name.replace('Sync', '').strip()
+            if parts:
+                repo_from_job = parts
+
+        # Get branches for this job from config
+        branches = []
+        if repo_from_job and repo_from_job in branch_config:
+            branches = branch_config[repo_from_job]
+
+        # Display class and label, so the page only has to fill them in
+        job_state = job['conclusion'] or job['status']
+        if job_state == 'success':
+            status_label = '✅ success'
+        elif job_state == 'failure':
+            status_label = '❌ failed'
+        else:
+            status_label = '⏳ in progress'
+
+        job_details.append({
+            'name': job_name,
+            'status': job['status'],
+            'conclusion': job['conclusion'],
+            'started_at': job['started_at'],
+            'completed_at': job['completed_at'],
+            'branches': branches,
+            'repo_from_job': repo_from_job,
+            'job_class': job_state.replace(' ', '_').replace('-', '_') if job_state else 'unknown',
+            'status_label': status_label,
+        })
+
+    job_summary = f"{success_jobs}✅"
+    if failure_jobs:
+        job_summary += f" / {failure_jobs}❌"
+    if in_progress_jobs:
+        job_summary += f" / {in_progress_jobs}⏳"
+
+    state = run['conclusion'] or run['status']
+
+    repo_data = RepoRow(
+        name=repo['full_name'],
+        url=repo['html_url'],
+        workflow_name=run['name'],
+        workflow_type=workflow_type,
+        status=run['status'],
+        conclusion=run['conclusion'],
+        state=state,
+        badge_class=badge_classes.get(state, 'badge-cancelled'),
+        run_url=run['html_url'],
+        # GitHub timestamps are always 'YYYY-MM-DDTHH:MM:SSZ' (UTC): cut out 'YYYY-MM-DD HH:MM' directly
+        updated_at=f"{run['updated_at'][:10]} {run['updated_at'][11:16]}",
+        run_id=run['id'],
+        branch=run['head_branch'],
+        jobs=job_details,
+        job_count=len(job_details),
+        success_jobs=success_jobs,
+        failure_jobs=failure_jobs,
+        in_progress_jobs=in_progress_jobs,
+        job_summary=job_summary,
+        sort_key=(
+            status_priority.get(state, 99),
+            repo['full_name'],  # Secondary sort by repo name
+        ),
+    )
+
+    return repo_data
+
+
+async def fetch_latest_workflow_run(session, actions_url, repo, workflow):
+    """Fetch the newest run of one workflow, plus its jobs, as a dashboard row (None if it never ran)
+
+    Only runs on the repo's default branch count, the same runs the GraphQL listing sees: runs of
+    pull requests and other branches don't decide what the dashboard shows.
+    """
+    params = {'per_page': 1, 'branch': repo['default_branch']}
+    if since_date:
+        params['created'] = f">={since_date}"
+    page = await fetch_json(session, f"{actions_url}/workflows/{workflow['id']}/runs", params)
+    if not page['workflow_runs']:
+        return None
+    run = page['workflow_runs'][0]
+
+    # Get jobs for this run (latest attempt only, so re-runs don't multiply the payload),
+    # unless they were already fetched while the run looked exactly like this
+    cache_key = f"{run['id']}@{run['updated_at']}"
+    jobs = jobs_cache.get(cache_key)
+    if jobs is None:
+        jobs = await fetch_all(session, f"{actions_url}/runs/{run['id']}/jobs", 'jobs', {'filter': 'latest'})
+        jobs_cache[cache_key] = [{field: job[field] for field in cached_job_fields} for job in jobs]
+    used_jobs.add(cache_key)
+    return build_repo_data(repo, run, jobs)
+
+
+async def fetch_repo(session, sem, repo):
+    """Fetch the latest run (and its jobs) of every matching workflow in a repo"""
+    repo_rows = []
+    async with sem:
+        try:
+            actions_url = f"{api_url}/repos/{repo['full_name']}/actions"
+            # The GraphQL listing has no default branch for a repo whose defaultBranchRef it failed to resolve
+            if not repo['default_branch']:
+                details = await fetch_json(session, f"{api_url}/repos/{repo['full_name']}")
+                repo = dict(repo, default_branch=details['default_branch'])
+
+            # Apply the workflow filter to the workflow list, then ask each one for its newest run only
+            workflows = await fetch_all(session, f"{actions_url}/workflows", 'workflows')
+            rows = await asyncio.gather(*(
+                fetch_latest_workflow_run(session, actions_url, repo, workflow)
+                for workflow in workflows if matches_workflow_filter(workflow['name'], workflow['path'])
+            ))
+            repo_rows.extend(row for row in rows if row)
+
+        except Exception as e:
+            print(f"  ✗ Error fetching {repo['full_name']}: {e}")
+
+    return repo_rows
+
+
+def graphql_repo_runs(node):
+    """Turn the Actions check suites of a GraphQL repository node into REST-shaped (run, jobs) pairs
+
+    Only runs on the default branch count, as in the REST fetch. Returns None when the repo has to
+    be fetched over REST instead: the query failed for it, a wanted run has more jobs than one page
+    of check runs, or a workflow file that passes the workflow filter has no run on the current HEAD
+    of the default branch (its latest run is on an older commit, which only REST can see).
+    """
+    if node is None:
+        return None
+    # No workflow files at all: nothing to show, and nothing to fall back to
+    if node['object'] is None:
+        return []
+    workflow_files = [f".github/workflows/{entry['name']}" for entry in node['object']['entries']
+                      if entry['name'].endswith(('.yml', '.yaml'))]
+
+    ref = node['defaultBranchRef']
+    suites = ref and ref['target'] and ref['target'].get('checkSuites')
+    # The HEAD commit can also have run on other branches (a branch cut from it, a pull request)
+    suites = [s for s in (suites['nodes'] if suites else [])
+              if s['workflowRun'] and (s['branch'] is None or s['branch']['name'] == ref['name'])]
+
+    runs = []
+    # checkSuites(last: N) is oldest first
+    for suite in reversed(suites):
+        workflow_run = suite['workflowRun']
+        run = {
+            'id': workflow_run['databaseId'],
+            'name': workflow_run['workflow']['name'],
+            'path': workflow_run['file']['path'] if workflow_run['file'] else '',
+            'status': suite['status'].lower(),
+            'conclusion': suite['conclusion'].lower() if suite['conclusion'] else None,
+            'html_url': workflow_run['url'],
+            'created_at': suite['createdAt'],
+            'updated_at': suite['updatedAt'],
+            'head_branch': ref['name'],
+        }
+        # More jobs than one page of check runs: REST paginates them
+        if suite['checkRuns']['pageInfo']['hasNextPage'] and matches_workflow_filter(run['name'], run['path']):
+            return None
+        jobs = [{
+            'name': check_run['name'],
+            'status': check_run['status'].lower(),
+            'conclusion': check_run['conclusion'].lower() if check_run['conclusion'] else None,
+            'started_at': check_run['startedAt'],
+            'completed_at': check_run['completedAt'],
+        } for check_run in suite['checkRuns']['nodes']]
+        runs.append((run, jobs))
+
+    # The display name of a workflow that didn't run on HEAD is unknown, so its file path has to match
+    ran_on_head = {run['path'] for run, jobs in runs}
+    if any(path not in ran_on_head and matches_workflow_filter('', path) for path in workflow_files):
+        return None
+    return runs
+
+
+async def fetch_graphql_repos(session):
+    """List the owner's non-archived repos together with their latest workflow runs, one GraphQL query per page
+
+    Returns (repo, runs) pairs, with runs None for repos that need a REST fetch, and whether the
+    listing is complete (if not, the REST listing has to fill in the repos that are missing).
+    """
+    listed = []
+    variables = {'login': user_login, 'cursor': None}
+    while True:
+        try:
+            async with api_request(session, 'POST', graphql_url, json={'query': graphql_repos_query, 'variables': variables}) as resp:
+                result = orjson.loads(await resp.read())
+        except Exception as e:
+            print(f"  ⚠️  GraphQL repo listing failed, falling back to REST: {e}")
+            return listed, False
+
+        owner = (result.get('data') or {}).get('repositoryOwner')
+        if not owner:
+            message = result['errors'][0]['message'] if result.get('errors') else f"no owner {user_login}"
+            print(f"  ⚠️  GraphQL repo listing failed, falling back to REST: {message}")
+            return listed, False
+        repositories = owner['repositories']
+
+        # A field the query failed to resolve comes back null with an error pointing at it; null would
+        # read as "nothing there", so those repos go to REST (all of the page if an error points elsewhere)
+        failed = set()
+        for error in result.get('errors') or ():
+            path = error.get('path') or []
+            if path[:3] != ['repositoryOwner', 'repositories', 'nodes'] or len(path) < 4:
+                failed = None
+                break
+            failed.add(path[3])
+        if failed is None:
+            print(f"  ⚠️  GraphQL errors in a page of repos, fetching them over REST: {result['errors'][0]['message']}")
+
+        complete = True
+        for index, node in enumerate(repositories['nodes']):
+            if node is None:
+                # A repo the query could not resolve, so its name is unknown too
+                complete = False
                 continue
-            
-            processed_workflows.add(run.name)
-            
-            # Determine workflow type/category
-            if 'sync-odoo' in workflow_name_lower:
-                workflow_type = '🐭 Odoo'
-            elif '3rd' in workflow_name_lower or 'third' in workflow_name_lower or 'sync-3rd' in workflow_name_lower:
-                workflow_type = '📦 3rd Party'
-            else:
-                workflow_type = '🔄 Other'
-            
-            # Get jobs for this run
-            jobs = run.jobs()
-            job_details = []
-            
-            for job in jobs:
-                job_name = job.name
-                
-                # Extract repo name from job name (e.g., "Sync linserv/CybroAddons" -> "linserv/CybroAddons")
-                repo_from_job = None
-                if 'Sync' in job_name:
-                    parts = job_name.replace('Sync', '').strip()
-                    if parts:
-                        repo_from_job = parts
-                
-                # Get branches for this job from config
-                branches = []
-                if repo_from_job and repo_from_job in branch_config:
-                    branches = branch_config[repo_from_job]
-                
-                job_details.append({
-                    'name': job_name,
-                    'status': job.status,
-                    'conclusion': job.conclusion,
-                    'started_at': job.started_at.isoformat() if job.started_at else None,
-                    'completed_at': job.completed_at.isoformat() if job.completed_at else None,
-                    'branches': branches,
-                    'repo_from_job': repo_from_job,
-                })
-            
-            repo_data = {
-                'name': repo.full_name,
-                'url': repo.html_url,
-                'workflow_name': run.name,
-                'workflow_type': workflow_type,
-                'status': run.status,
-                'conclusion': run.conclusion,
-                'run_url': run.html_url,
-                'updated_at': run.updated_at.isoformat(),
-                'branch': run.head_branch,
-                'jobs': job_details,
-                'job_count': len(job_details)
-            }
-            
-            dashboard_data.append(repo_data)
-            
-            # Summary for console
-            success_count = sum(1 for j in job_details if j['conclusion'] == 'success')
-            failure_count = sum(1 for j in job_details if j['conclusion'] == 'failure')
-            
-            print(f"  ✓ {repo.full_name}: {run.conclusion or run.status} "
-                  f"(workflow: {run.name}, jobs: {success_count}✅/{failure_count}❌)")
-        
-    except Exception as e:
-        print(f"  ✗ Error fetching {repo.full_name}: {e}")
-        continue
+            repo = {'full_name': node['nameWithOwner'], 'html_url': node['url'],
+                    'default_branch': node['defaultBranchRef'] and node['defaultBranchRef']['name']}
+            if failed is None or index in failed:
+                listed.append((repo, None))
+                continue
+            try:
+                runs = graphql_repo_runs(node)
+            except Exception as e:
+                print(f"  ⚠️  Unexpected GraphQL data for {repo['full_name']}: {e}")
+                runs = None
+            listed.append((repo, runs))
 
-# Sort by status (failed first, then in progress, then success)
-# Then by workflow type
-status_priority = {'failure': 0, 'cancelled': 1, 'in_progress': 2, 'success': 3, 'completed': 4}
-workflow_type_priority = {
-    '🐭 Odoo': 0,
-    '📦 3rd Party': 1,
-    '🔄 Other': 2
-}
+        page_info = repositories['pageInfo']
+        if not page_info['hasNextPage']:
+            return listed, complete
+        variables['cursor'] = page_info['endCursor']
 
-dashboard_data.sort(key=lambda x: (
-    workflow_type_priority.get(x['workflow_type'], 99),
-    status_priority.get(x['conclusion'] or x['status'], 99),
-    x['name']  # Secondary sort by repo name
-))
-
-# Generate HTML
-html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>GitHub Actions Dashboard - {user_login}</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: #0d1117;
-            color: #c9d1d9;
-            padding: 20px;
-        }}
-        .container {{
-            max-width: 1600px;
-            margin: 0 auto;
-        }}
-        h1 {{
-            margin-bottom: 10px;
-            color: #58a6ff;
-        }}
-        h2 {{
-            margin-top: 30px;
-            margin-bottom: 20px;
-            color: #8b949e;
-            font-size: 18px;
-            padding-bottom: 10px;
-            border-bottom: 1px solid #30363d;
-        }}
-        .last-updated {{
-            color: #8b949e;
-            margin-bottom: 30px;
-            font-size: 13px;
-        }}
-        .stats {{
-            display: flex;
-            gap: 20px;
-            margin-bottom: 30px;
-            flex-wrap: wrap;
-        }}
-        .stat-card {{
-            background: #161b22;
-            padding: 20px;
-            border-radius: 6px;
-            border: 1px solid #30363d;
-            flex: 1;
-            min-width: 150px;
-        }}
-        .stat-number {{
-            font-size: 32px;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-        .stat-label {{
-            color: #8b949e;
-            font-size: 14px;
-        }}
-        .success {{ color: #3fb950; }}
-        .failure {{ color: #f85149; }}
-        .in-progress {{ color: #d29922; }}
-        .dashboard-row {{
-            background: #161b22;
-            border: 1px solid #30363d;
-            border-radius: 6px;
-            margin-bottom: 16px;
-            padding: 16px;
-            transition: background-color 0.2s;
-        }}
-        .dashboard-row:hover {{
-            background: #1c2128;
-        }}
-        .row-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 12px;
-            flex-wrap: wrap;
-            gap: 12px;
-        }}
-        .repo-info {{
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            flex: 1;
-            min-width: 300px;
-            flex-wrap: wrap;
-        }}
-        .repo-name {{
-            font-weight: 600;
-            color: #58a6ff;
-        }}
-        .branch-badge {{
-            background: #1f6feb;
-            color: #fff;
-            padding: 2px 8px;
-            border-radius: 12px;
-            font-size: 12px;
-            font-weight: 500;
-        }}
-        .status-badge {{
-            display: inline-block;
-            padding: 4px 12px;
-            border-radius: 12px;
-            font-size: 12px;
-            font-weight: 600;
-            text-transform: uppercase;
-        }}
-        .badge-success {{
-            background: #1a3c25;
-            color: #3fb950;
-        }}
-        .badge-failure {{
-            background: #3c1c1f;
-            color: #f85149;
-        }}
-        .badge-in-progress {{
-            background: #3c2e1a;
-            color: #d29922;
-        }}
-        .badge-cancelled {{
-            background: #2b2f36;
-            color: #8b949e;
-        }}
-        .meta-info {{
-            display: flex;
-            gap: 16px;
-            font-size: 12px;
-            color: #8b949e;
-            flex-wrap: wrap;
-        }}
-        .meta-item {{
-            display: flex;
-            align-items: center;
-            gap: 4px;
-        }}
-        a {{
-            color: #58a6ff;
-            text-decoration: none;
-        }}
-        a:hover {{
-            text-decoration: underline;
-        }}
-        .job-summary {{
-            font-size: 12px;
-            color: #c9d1d9;
-            font-weight: 500;
-        }}
-        .jobs-container {{
-            margin-top: 12px;
-            padding-top: 12px;
-            border-top: 1px solid #30363d;
-        }}
-        .jobs-title {{
-            font-size: 12px;
-            font-weight: 600;
-            color: #8b949e;
-            text-transform: uppercase;
-            margin-bottom: 8px;
-        }}
-        .job-list {{
-            display: grid;
-            gap: 8px;
-        }}
-        .job-item {{
-            background: #0d1117;
-            border-radius: 4px;
-            padding: 10px 12px;
-            border-left: 3px solid;
-            display: flex;
-            flex-direction: column;
-            gap: 6px;
-            font-size: 12px;
-        }}
-        .job-item.success {{
-            border-left-color: #3fb950;
-            background: rgba(63, 185, 80, 0.1);
-        }}
-        .job-item.failure {{
-            border-left-color: #f85149;
-            background: rgba(248, 81, 73, 0.1);
-        }}
-        .job-item.in_progress {{
-            border-left-color: #d29922;
-            background: rgba(210, 153, 34, 0.1);
-        }}
-        .job-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            gap: 8px;
-            flex-wrap: wrap;
-        }}
-        .job-name {{
-            flex: 1;
-            word-break: break-word;
-            font-weight: 500;
-        }}
-        .job-status {{
-            display: inline-block;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-size: 11px;
-            white-space: nowrap;
-        }}
-        .job-status.success {{
-            background: rgba(63, 185, 80, 0.2);
-            color: #3fb950;
-        }}
-        .job-status.failure {{
-            background: rgba(248, 81, 73, 0.2);
-            color: #f85149;
-        }}
-        .job-status.in_progress {{
-            background: rgba(210, 153, 34, 0.2);
-            color: #d29922;
-        }}
-        .branches-list {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 6px;
-            margin-top: 4px;
-        }}
-        .branch-item {{
-            background: rgba(88, 166, 255, 0.15);
-            border: 1px solid rgba(88, 166, 255, 0.3);
-            color: #58a6ff;
-            padding: 3px 8px;
-            border-radius: 4px;
-            font-size: 11px;
-            font-weight: 500;
-        }}
-        .branch-item.success {{
-            background: rgba(63, 185, 80, 0.15);
-            border-color: rgba(63, 185, 80, 0.3);
-            color: #3fb950;
-        }}
-        .branch-item.failure {{
-            background: rgba(248, 81, 73, 0.15);
-            border-color: rgba(248, 81, 73, 0.3);
-            color: #f85149;
-        }}
-        .filter-badge {{
-            display: inline-block;
-            background: #1f6feb;
-            color: #fff;
-            padding: 4px 12px;
-            border-radius: 12px;
-            font-size: 13px;
-            margin-left: 10px;
-            font-weight: 500;
-        }}
-        .workflow-section {{
-            margin-bottom: 40px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🚀 GitHub Actions Dashboard - {user_login}{f'<span class="filter-badge">🔍 {", ".join(workflow_filters)}</span>' if workflow_filters else ''}</h1>
-        <p class="last-updated">Last updated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC</p>
-        
-        <div class="stats">
-            <div class="stat-card">
-                <div class="stat-number">{len(dashboard_data)}</div>
-                <div class="stat-label">Total Runs</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number success">{sum(1 for r in dashboard_data if r['conclusion'] == 'success')}</div>
-                <div class="stat-label">Passing</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number failure">{sum(1 for r in dashboard_data if r['conclusion'] == 'failure')}</div>
-                <div class="stat-label">Failing</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number in-progress">{sum(1 for r in dashboard_data if r['status'] == 'in_progress')}</div>
-                <div class="stat-label">In Progress</div>
-            </div>
-        </div>
-"""
 
-# Group by workflow type
-workflow_groups = {}
-for repo in dashboard_data:
-    wf_type = repo['workflow_type']
-    if wf_type not in workflow_groups:
-        workflow_groups[wf_type] = []
-    workflow_groups[wf_type].append(repo)
-
-# Generate sections for each workflow type
-for workflow_type in sorted(workflow_groups.keys(), key=lambda x: workflow_type_priority.get(x, 99)):
-    repos_in_group = workflow_groups[workflow_type]
-    
-    html += f"""
-        <div class="workflow-section">
-            <h2>{workflow_type} - {len(repos_in_group)} runs</h2>
-"""
-    
-    for repo in repos_in_group:
-        conclusion = repo['conclusion'] or repo['status']
-        badge_class = f"badge-{conclusion.replace('_', '-')}" if conclusion else "badge-cancelled"
-        
-        # Format date
+async def list_active_repos(session, owner_qualifier, repos_url):
+    """List the owner's non-archived repos (forks included), letting the search API drop archived ones
+
+    Only the fields the dashboard uses are kept, the same shape the GraphQL listing produces.
+    """
+    search, next_url = await get_json(session, f"{api_url}/search/repositories", {
+        'q': f"{owner_qualifier} archived:false fork:true",
+        'per_page': 100,
+    })
+
+    # Search only ever returns the first 1000 hits: list everything and filter locally instead
+    if search['incomplete_results'] or search['total_count'] > 1000:
+        repos = await fetch_all(session, repos_url, None)
+        return [{'full_name': repo['full_name'], 'html_url': repo['html_url'], 'default_branch': repo['default_branch']}
+                for repo in repos if not repo['archived']]
+
+    repos = []
+    while True:
+        repos.extend({'full_name': repo['full_name'], 'html_url': repo['html_url'], 'default_branch': repo['default_branch']}
+                     for repo in search['items'])
+        if not next_url:
+            return repos
+        search, next_url = await get_json(session, next_url)
+
+
+async def fetch_dashboard_data(on_rows=None):
+    """Fetch everything the dashboard needs over one pooled, keep-alive session
+
+    `on_rows`, if given, is called with each batch of rows as soon as it is ready.
+    """
+    headers = {
+        'Authorization': f"Bearer {github_token}",
+        'Accept': 'application/vnd.github+json',
+        # Compressed REST/GraphQL bodies; aiohttp decodes them transparently
+        'Accept-Encoding': 'gzip, deflate',
+    }
+    connector = aiohttp.TCPConnector(limit=pool_size, limit_per_host=pool_size)
+    # GraphQL request bodies are encoded by orjson too
+    async with aiohttp.ClientSession(headers=headers, connector=connector,
+                                     json_serialize=lambda obj: orjson.dumps(obj).decode()) as session:
+        # Get user or organization
+        entity = await fetch_json(session, f"{api_url}/users/{user_login}")
+        if entity['type'] == 'Organization':
+            owner_qualifier = f"org:{user_login}"
+            repos_url = f"{api_url}/orgs/{user_login}/repos"
+            print(f"Fetching workflow status for organization: {user_login}")
+        else:
+            owner_qualifier = f"user:{user_login}"
+            repos_url = f"{api_url}/users/{user_login}/repos"
+            print(f"Fetching workflow status for user: {user_login}")
+
+        # Read the workflow files of the dashboard repo while listing all repos (except archived ones) with their runs
+        print("Loading workflow branch configurations...")
+        dashboard_repo = f"{user_login}/sync-forks"
+        *configs, (listed, complete) = await asyncio.gather(
+            load_workflow_branches_from_repo(session, dashboard_repo, 'sync-odoo.yml'),
+            load_workflow_branches_from_repo(session, dashboard_repo, 'sync-3rd-party.yml'),
+            fetch_graphql_repos(session),
+        )
+        for config in configs:
+            branch_config.update(config)
+        if not branch_config:
+            print("  ℹ️  Make sure the repository is named 'sync-forks'")
+
+        print(f"Total repos with branch info: {len(branch_config)}\n")
+
+        sem = asyncio.Semaphore(concurrency)
+        rows = []
+        rest_repos = []
+
+        # Rows straight from the GraphQL listing; REST only for repos it could not answer
+        for repo, runs in listed:
+            if runs is None:
+                rest_repos.append(repo)
+                continue
+            latest = {run['id']: jobs for run, jobs in runs}
+            recent = (run for run, jobs in runs if not since_date or run['created_at'] >= since_date)
+            for run in select_latest_runs(recent):
+                rows.append(build_repo_data(repo, run, latest[run['id']]))
+        if on_rows and rows:
+            on_rows(rows[:])
+
+        # Repos the GraphQL listing never got to
+        if not complete:
+            seen = {repo['full_name'] for repo, runs in listed}
+            rest_repos.extend(repo for repo in await list_active_repos(session, owner_qualifier, repos_url)
+                              if repo['full_name'] not in seen)
+
+        tasks = [fetch_repo(session, sem, repo) for repo in rest_repos]
+        for task in asyncio.as_completed(tasks):
+            try:
+                repo_rows = await task
+            except Exception as e:
+                print(f"  ✗ Error fetching repo: {e}")
+                continue
+            rows.extend(repo_rows)
+            if on_rows and repo_rows:
+                on_rows(repo_rows)
+
+    # Summary for console, printed once everything is in so concurrent fetches don't interleave it
+    for row in sorted(rows, key=attrgetter('name', 'workflow_name')):
+        print(f"  ✓ {row.name}: {row.state} "
+              f"(workflow: {row.workflow_name}, jobs: {row.success_jobs}✅/{row.failure_jobs}❌)")
+    return rows
+
+
+def count_stats(rows):
+    """Stat card numbers: conclusions and statuses share one Counter, each counted in C"""
+    stats = Counter(r.conclusion for r in rows)
+    stats.update(r.status for r in rows)
+    stats['total'] = len(rows)
+    return stats
+
+
+class LiveFetch:
+    """One fetch of the dashboard data, shared by every /stream client that connects while it runs"""
+
+    def __init__(self):
+        self.rows = []
+        self.jobs = {}
+        self.error = None
+        self.done = False
+        self.changed = asyncio.Event()
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self):
         try:
-            updated = datetime.fromisoformat(repo['updated_at'].replace('Z', '+00:00'))
-            time_str = updated.strftime('%Y-%m-%d %H:%M')
-        except:
-            time_str = repo['updated_at']
-        
-        # Job summary
-        jobs = repo['jobs']
-        success_jobs = sum(1 for j in jobs if j['conclusion'] == 'success')
-        failure_jobs = sum(1 for j in jobs if j['conclusion'] == 'failure')
-        in_progress_jobs = sum(1 for j in jobs if j['status'] == 'in_progress')
-        
-        job_summary = f"{success_jobs}✅"
-        if failure_jobs > 0:
-            job_summary += f" / {failure_jobs}❌"
-        if in_progress_jobs > 0:
-            job_summary += f" / {in_progress_jobs}⏳"
-        
-        # Build jobs HTML with branches
-        jobs_html = ""
-        if len(jobs) > 0:
-            jobs_html = '<div class="jobs-container">'
-            jobs_html += '<div class="jobs-title">📊 Job Details</div>'
-            jobs_html += '<div class="job-list">'
-            
-            for job in jobs:
-                job_conclusion = job['conclusion'] or job['status']
-                job_class = job_conclusion.replace(' ', '_').replace('-', '_') if job_conclusion else 'unknown'
-                
-                job_display_name = job['name']
-                if 'Sync' in job['name']:
-                    parts = job['name'].replace('Sync', '').strip()
-                    job_display_name = f"<strong>{parts}</strong>"
-                
-                status_badge = f'<span class="job-status {job_class}">{"✅ success" if job_conclusion == "success" else "❌ failed" if job_conclusion == "failure" else "⏳ in progress"}</span>'
-                
-                # Build branches display
-                branches_html = ""
-                if job.get('branches') and len(job['branches']) > 0:
-                    branches_html = '<div class="branches-list">'
-                    for branch in job['branches']:
-                        branches_html += f'<span class="branch-item {job_class}">🌿 {branch}</span>'
-                    branches_html += '</div>'
-                
-                jobs_html += f'''
-                    <div class="job-item {job_class}">
-                        <div class="job-header">
-                            <span class="job-name">{job_display_name}</span>
-                            {status_badge}
-                        </div>
-                        {branches_html}
-                    </div>
-                '''
-            
-            jobs_html += '</div></div>'
-        
-        html += f"""
-            <div class="dashboard-row">
-                <div class="row-header">
-                    <div class="repo-info">
-                        <span class="repo-name"><a href="{repo['url']}" target="_blank">📁 {repo['name']}</a></span>
-                        <span class="branch-badge">🌿 {repo['branch']}</span>
-                    </div>
-                    <span class="status-badge {badge_class}">{conclusion.upper()}</span>
-                </div>
-                <div class="meta-info">
-                    <div class="meta-item">
-                        <span>Workflow:</span>
-                        <strong>{repo['workflow_name']}</strong>
-                    </div>
-                    <div class="meta-item">
-                        <span>Jobs:</span>
-                        <strong class="job-summary">{job_summary}</strong>
-                    </div>
-                    <div class="meta-item">
-                        <span>Updated:</span>
-                        <strong>{time_str}</strong>
-                    </div>
-                    <div class="meta-item">
-                        <a href="{repo['run_url']}" target="_blank">View Run →</a>
-                    </div>
-                </div>
-                {jobs_html}
-            </div>
-"""
-    
-    html += """
-        </div>
-"""
+            await fetch_dashboard_data(on_rows=self.add_rows)
+        except Exception as e:
+            print(f"Live fetch failed: {e!r}")
+            self.error = str(e) or type(e).__name__
+        self.done = True
+        self.notify()
 
-html += """
-    </div>
-</body>
-</html>
-"""
+    def add_rows(self, rows):
+        for row in rows:
+            self.jobs[row.run_id] = orjson.dumps(row.jobs)
+        self.rows.extend(rows)
+        self.notify()
+
+    def notify(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    async def follow(self):
+        """Yield every row from the first one on, waiting for the rest as they arrive"""
+        sent = 0
+        while True:
+            changed = self.changed
+            while sent < len(self.rows):
+                yield self.rows[sent]
+                sent += 1
+            if self.done:
+                return
+            await changed.wait()
+
+
+# The current (or last) LiveFetch, under 'fetch'
+live_key = web.AppKey('live', dict)
+
+
+async def live_page(request):
+    """Serve the page shell; its rows arrive over /stream"""
+    html = template_env.get_template('dashboard.html.j2').render(
+        user_login=user_login,
+        workflow_filters=workflow_filters,
+        css_version=css_version,
+        last_updated=datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+        stats=Counter(),
+        sections=[],
+        live=True,
+    )
+    return web.Response(text=html, content_type='text/html')
+
+
+async def live_stream(request):
+    """Send every row as a server-sent event as soon as its repo is done
+
+    Clients that connect while a fetch is running join it instead of starting their own.
+    """
+    dashboard_row = template_env.get_template('dashboard_row.html.j2').module.dashboard_row
+    resp = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'})
+    await resp.prepare(request)
+
+    live = request.app[live_key]
+    if live.get('fetch') is None or live['fetch'].done:
+        live['fetch'] = LiveFetch()
+    fetch = live['fetch']
+
+    async for row in fetch.follow():
+        await resp.write(b"data: " + orjson.dumps(str(dashboard_row(row))) + b"\n\n")
+    if fetch.error:
+        # A custom event: the page closes the stream rather than EventSource reconnecting into another fetch
+        await resp.write(b"event: failed\ndata: " + orjson.dumps(fetch.error) + b"\n\n")
+        return resp
+
+    stats = count_stats(fetch.rows)
+    done = {key: stats[key] for key in ('total', 'success', 'failure', 'in_progress')}
+    await resp.write(b"event: done\ndata: " + orjson.dumps(done) + b"\n\n")
+    return resp
+
+
+async def live_stylesheet(request):
+    """Serve the stylesheet; the fingerprinted link makes it safe to cache for good"""
+    return web.Response(text=dashboard_css, content_type='text/css',
+                        headers={'Cache-Control': 'public, max-age=31536000, immutable'})
+
+
+async def live_job_details(request):
+    """Serve the job details of a run streamed earlier, like output/jobs/<run id>.json"""
+    fetch = request.app[live_key].get('fetch')
+    jobs = fetch and fetch.jobs.get(int(request.match_info['run_id']))
+    if jobs is None:
+        raise web.HTTPNotFound()
+    return web.Response(body=jobs, content_type='application/json')
+
+
+def main():
+    """Fetch every run and write the dashboard to output/, or serve it live"""
+    print(f"Workflow filter: {workflow_filters if workflow_filters else 'None (showing all workflows)'}")
+
+    load_cache(etag_cache_file, etag_cache)
+    load_cache(jobs_cache_file, jobs_cache)
+
+    # Live mode: no output/ at all, the page fills itself in from the running fetch
+    if live_port:
+        app = web.Application()
+        app[live_key] = {}
+        app.router.add_get('/', live_page)
+        app.router.add_get('/stream', live_stream)
+        app.router.add_get('/dashboard.css', live_stylesheet)
+        app.router.add_get(r'/jobs/{run_id:\d+}.json', live_job_details)
+        web.run_app(app, host=live_host, port=live_port)
+        # Leave the caches alone if no page was ever streamed
+        if used_etags:
+            save_cache(etag_cache_file, etag_cache, used_etags)
+            save_cache(jobs_cache_file, jobs_cache, used_jobs)
+        return
+
+    dashboard_data = asyncio.run(fetch_dashboard_data())
+    save_cache(etag_cache_file, etag_cache, used_etags)
+    save_cache(jobs_cache_file, jobs_cache, used_jobs)
+
+    # Sections for each workflow type, in type order; only the rows within a section need sorting
+    workflow_groups = defaultdict(list)
+    for row in dashboard_data:
+        workflow_groups[row.workflow_type].append(row)
+    sections = []
+    for workflow_type in sorted(workflow_groups, key=lambda t: workflow_type_priority.get(t, 99)):
+        # Sort by status, then by repo name (keys precomputed in build_repo_data)
+        workflow_groups[workflow_type].sort(key=attrgetter('sort_key'))
+        sections.append((workflow_type, workflow_groups[workflow_type]))
+
+    # Stat cards
+    stats = count_stats(dashboard_data)
+
+    # Create output directory
+    os.makedirs('output', exist_ok=True)
+
+    # Stylesheet, only rewritten when it changed
+    css_file = os.path.join('output', 'dashboard.css')
+    try:
+        with open(css_file) as f:
+            css_changed = f.read() != dashboard_css
+    except FileNotFoundError:
+        css_changed = True
+    if css_changed:
+        with open(css_file, 'w') as f:
+            f.write(dashboard_css)
+
+    # Job details, fetched by the page only when a row is expanded (stale runs are dropped)
+    jobs_dir = os.path.join('output', 'jobs')
+    shutil.rmtree(jobs_dir, ignore_errors=True)
+    os.makedirs(jobs_dir)
+    for row in dashboard_data:
+        if row.jobs:
+            with open(os.path.join(jobs_dir, f"{row.run_id}.json"), 'wb') as f:
+                f.write(orjson.dumps(row.jobs))
+
+    # Render the page template, streaming it as UTF-8 into a temporary file; it replaces the published
+    # page (and its compressed copy) only once complete, so a half-written page is never served
+    template = template_env.get_template('dashboard.html.j2')
+    with open('output/index.html.tmp', 'wb', buffering=1 << 20) as f:
+        template.stream(
+            user_login=user_login,
+            workflow_filters=workflow_filters,
+            css_version=css_version,
+            last_updated=generated_at,
+            stats=stats,
+            sections=sections,
+        ).dump(f, encoding='utf-8')
 
-# Create output directory
-os.makedirs('output', exist_ok=True)
+    # Pre-compressed copy for static hosts that serve .gz files directly
+    with open('output/index.html.tmp', 'rb') as f_in, gzip.open('output/index.html.gz.tmp', 'wb', compresslevel=9) as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.replace('output/index.html.gz.tmp', 'output/index.html.gz')
+    os.replace('output/index.html.tmp', 'output/index.html')
 
-# Write HTML file
-with open('output/index.html', 'w') as f:
-    f.write(html)
+    print(f"\n✅ Dashboard generated successfully!")
+    print(f"   Total runs tracked: {len(dashboard_data)}")
+    print(f"   Filter applied: {workflow_filters if workflow_filters else 'None'}")
+    print(f"   Branch config loaded: {len(branch_config)} repos")
 
-print(f"\n✅ Dashboard generated successfully!")
-print(f"   Total runs tracked: {len(dashboard_data)}")
-print(f"   Filter applied: {workflow_filters if workflow_filters else 'None'}")
-print(f"   Branch config loaded: {len(branch_config)} repos")
 
-# Close connection
-g.close()
+if __name__ == '__main__':
+    main()